@@ -1,17 +1,35 @@
 import os
 import logging
-from flask import Flask, render_template, request, jsonify, redirect, url_for, flash
-from werkzeug.utils import secure_filename
+from flask import Flask, Response, render_template, stream_with_context, request, jsonify, redirect, url_for, flash
+from flask.json.provider import DefaultJSONProvider
 from werkzeug.middleware.proxy_fix import ProxyFix
+from services import json_codec
 from services.file_handler import FileHandler
 from services.text_extractor import TextExtractor
 from services.ai_analyzer import AIAnalyzer
+from services.analysis_cache import AnalysisCache
+from services.semantic_cache import SemanticCache
+from services.job_queue import JobQueue
+from services.text_store import TextStore
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+class JSONCodecProvider(DefaultJSONProvider):
+    """JSON provider serializing compact responses with orjson when available"""
+    
+    def dumps(self, obj, **kwargs):
+        # Pretty-printed (debug) output keeps the stdlib encoder
+        if 'indent' in kwargs:
+            return super().dumps(obj, **kwargs)
+        return json_codec.dumps(obj)
+    
+    def loads(self, s, **kwargs):
+        return json_codec.loads(s)
+
 app = Flask(__name__)
+app.json = JSONCodecProvider(app)
 app.secret_key = os.environ.get("SESSION_SECRET", "dev-secret-key")
 app.wsgi_app = ProxyFix(app.wsgi_app, x_proto=1, x_host=1)
 
@@ -19,6 +37,8 @@ app.wsgi_app = ProxyFix(app.wsgi_app, x_proto=1, x_host=1)
 UPLOAD_FOLDER = 'uploads'
 MAX_FILE_SIZE = 16 * 1024 * 1024  # 16MB
 ALLOWED_EXTENSIONS = {'pdf', 'png', 'jpg', 'jpeg'}
+IMAGE_EXTENSIONS = frozenset({'png', 'jpg', 'jpeg'})
+INLINE_TEXT_CHARS = int(os.environ.get('INLINE_TEXT_CHARS', '200000'))  # Longer text is lazy-loaded
 
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = MAX_FILE_SIZE
@@ -30,123 +50,187 @@ os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 file_handler = FileHandler(UPLOAD_FOLDER, ALLOWED_EXTENSIONS)
 text_extractor = TextExtractor()
 ai_analyzer = AIAnalyzer()
+analysis_cache = AnalysisCache(cache_dir=os.environ.get('ANALYSIS_CACHE_DIR'))
+upload_text_cache = AnalysisCache(max_entries=256, namespace='upload_text', cache_dir=os.environ.get('ANALYSIS_CACHE_DIR'))
+semantic_cache = SemanticCache()
+job_queue = JobQueue(max_workers=int(os.environ.get('JOB_WORKERS', '4')))
+text_store = TextStore()
+
+def warmup():
+    """Load models before accepting requests"""
+    # Not run at import: OCR pool workers re-run the __main__ script, and
+    # Gunicorn calls this from post_worker_init in every worker instead
+    ai_analyzer.warmup()
+    text_extractor.warmup()
+    semantic_cache.warmup()
+
+def analyze_extracted_text(text):
+    """Analyze text, reusing results for exact and near-duplicate documents"""
+    return analysis_cache.get_or_analyze(
+        text,
+        lambda text: semantic_cache.get_or_analyze(text, ai_analyzer.analyze_content, ai_analyzer.refresh_text_metrics)
+    )
+
+def process_upload_job(upload, original_filename):
+    """Extract text from an upload and analyze it"""
+    try:
+        # Identical files skip extraction; their analysis is then cached by text
+        cached = upload_text_cache.get(upload['sha256'])
+        if cached is not None:
+            logger.info(f"Upload cache hit: {upload['sha256'][:12]}")
+            extracted_text = cached['text']
+        else:
+            # Extract text
+            file_extension = upload['extension']
+            extracted_text = ""
+            
+            if file_extension == 'pdf':
+                extracted_text = text_extractor.extract_from_pdf(upload['source'])
+            elif file_extension in IMAGE_EXTENSIONS:
+                extracted_text = text_extractor.extract_from_image(upload['source'])
+            
+            if extracted_text:
+                upload_text_cache.set(upload['sha256'], {'text': extracted_text})
+    
+    finally:
+        # Release file before the slow analysis step
+        file_handler.discard_upload(upload)
+    
+    if not extracted_text or len(extracted_text.strip()) < 10:
+        return {'error': 'Could not extract sufficient text from the file'}
+    
+    # Perform analysis
+    analysis_results = analyze_extracted_text(extracted_text)
+    
+    return {
+        'success': True,
+        'extracted_text': extracted_text,
+        'analysis': analysis_results,
+        'original_filename': original_filename
+    }
 
 @app.route('/')
 def index():
     """Main page with file upload form"""
     return render_template('index.html')
 
+def handle_upload(run_async=False):
+    """
+    Receive the uploaded file and process it
+    
+    Args:
+        run_async (bool): Queue processing as a background job instead
+        
+    Returns:
+        tuple: (payload dict, HTTP status code)
+    """
+    # Stream the upload into memory (large files spill to disk)
+    original_filename, upload, error_msg = file_handler.stream_upload(request.stream, request.content_type)
+    if original_filename is None:
+        return {'error': 'No file provided'}, 400
+    
+    if original_filename == '':
+        return {'error': 'No file selected'}, 400
+    
+    # Validate file
+    if not file_handler.is_allowed_file(original_filename):
+        return {'error': 'Invalid file type. Please upload PDF, PNG, or JPG files only.'}, 400
+    
+    # Content that is not the declared type, empty or too large is the client's error
+    if error_msg:
+        return {'error': error_msg}, 400
+    
+    if not upload:
+        return {'error': 'Failed to save file'}, 500
+    
+    # Long-running OCR and analysis can run in the background
+    if run_async:
+        job_id = job_queue.enqueue(process_upload_job, upload, original_filename)
+        return {
+            'job_id': job_id,
+            'status_url': url_for('api_result', job_id=job_id)
+        }, 202
+    
+    result = process_upload_job(upload, original_filename)
+    if result.get('error'):
+        return result, 400
+    
+    return result, 200
+
 @app.route('/upload', methods=['POST'])
 def upload_file():
     """Handle file upload and processing"""
     try:
-        if 'file' not in request.files:
-            flash('No file selected', 'error')
-            return redirect(url_for('index'))
-        
-        file = request.files['file']
-        if file.filename == '':
-            flash('No file selected', 'error')
-            return redirect(url_for('index'))
-        
-        # Validate and save file
-        if not file_handler.is_allowed_file(file.filename):
-            flash('Invalid file type. Please upload PDF, PNG, or JPG files only.', 'error')
-            return redirect(url_for('index'))
-        
-        filename = file_handler.save_file(file)
-        if not filename:
-            flash('Failed to save file', 'error')
-            return redirect(url_for('index'))
-        
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        
-        # Extract text based on file type
-        file_extension = filename.rsplit('.', 1)[1].lower()
-        extracted_text = ""
-        
-        if file_extension == 'pdf':
-            extracted_text = text_extractor.extract_from_pdf(filepath)
-        elif file_extension in ['png', 'jpg', 'jpeg']:
-            extracted_text = text_extractor.extract_from_image(filepath)
-        
-        if not extracted_text or len(extracted_text.strip()) < 10:
-            flash('Could not extract sufficient text from the file', 'error')
-            file_handler.cleanup_file(filepath)
-            return redirect(url_for('index'))
-        
-        # Perform AI analysis
-        analysis_results = ai_analyzer.analyze_content(extracted_text)
+        result, status = handle_upload()
+        if result.get('error'):
+            return render_template('index.html', error=result['error']), status
         
-        # Clean up uploaded file
-        file_handler.cleanup_file(filepath)
-        
-        # Store results in session for display
+        # Long text is rendered as a preview; the page loads the rest from /api/text
+        extracted_text = result['extracted_text']
         session_data = {
-            'original_filename': file.filename,
-            'extracted_text': extracted_text,
-            'analysis': analysis_results
+            'original_filename': result['original_filename'],
+            'extracted_text': extracted_text[:INLINE_TEXT_CHARS],
+            'text_truncated': len(extracted_text) > INLINE_TEXT_CHARS,
+            'result_id': text_store.put(extracted_text),
+            'analysis': result['analysis']
         }
         
         return render_template('results.html', data=session_data)
         
     except Exception as e:
         logger.error(f"Error processing file: {str(e)}")
-        flash(f'Error processing file: {str(e)}', 'error')
-        return redirect(url_for('index'))
+        return render_template('index.html', error=f'Error processing file: {str(e)}'), 500
 
 @app.route('/api/upload', methods=['POST'])
 def api_upload():
     """API endpoint for AJAX file upload"""
     try:
-        if 'file' not in request.files:
-            return jsonify({'error': 'No file provided'}), 400
-        
-        file = request.files['file']
-        if file.filename == '':
-            return jsonify({'error': 'No file selected'}), 400
-        
-        # Validate file
-        if not file_handler.is_allowed_file(file.filename):
-            return jsonify({'error': 'Invalid file type. Please upload PDF, PNG, or JPG files only.'}), 400
-        
-        # Save file
-        filename = file_handler.save_file(file)
-        if not filename:
-            return jsonify({'error': 'Failed to save file'}), 500
-        
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        
-        # Extract text
-        file_extension = filename.rsplit('.', 1)[1].lower()
-        extracted_text = ""
-        
-        if file_extension == 'pdf':
-            extracted_text = text_extractor.extract_from_pdf(filepath)
-        elif file_extension in ['png', 'jpg', 'jpeg']:
-            extracted_text = text_extractor.extract_from_image(filepath)
-        
-        if not extracted_text or len(extracted_text.strip()) < 10:
-            file_handler.cleanup_file(filepath)
-            return jsonify({'error': 'Could not extract sufficient text from the file'}), 400
-        
-        # Perform analysis
-        analysis_results = ai_analyzer.analyze_content(extracted_text)
-        
-        # Clean up file
-        file_handler.cleanup_file(filepath)
-        
-        return jsonify({
-            'success': True,
-            'extracted_text': extracted_text,
-            'analysis': analysis_results,
-            'original_filename': file.filename
-        })
+        result, status = handle_upload(run_async=request.args.get('async') == '1')
+        return jsonify(result), status
         
     except Exception as e:
         logger.error(f"API upload error: {str(e)}")
         return jsonify({'error': f'Processing failed: {str(e)}'}), 500
 
+@app.route('/api/result/<job_id>')
+def api_result(job_id):
+    """API endpoint for polling a background upload job"""
+    job = job_queue.get_status(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    return jsonify(job)
+
+@app.route('/api/text/<result_id>')
+def api_text(result_id):
+    """API endpoint streaming the extracted text of a rendered result"""
+    text = text_store.get(result_id)
+    if text is None:
+        return jsonify({'error': 'Text not found or expired'}), 404
+    
+    def generate():
+        for start in range(0, len(text), 65536):
+            yield text[start:start + 65536]
+    
+    return Response(stream_with_context(generate()), mimetype='text/plain')
+
+@app.route('/api/suggestions/<result_id>/stream')
+def api_suggestions_stream(result_id):
+    """API endpoint streaming engagement suggestions for a rendered result as server-sent events"""
+    text = text_store.get(result_id)
+    if text is None:
+        return jsonify({'error': 'Text not found or expired'}), 404
+    
+    def generate():
+        for event in ai_analyzer.stream_engagement_suggestions(text):
+            yield f"data: {json_codec.dumps(event)}\n\n"
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 @app.errorhandler(413)
 def file_too_large(error):
     flash('File too large. Maximum file size is 16MB.', 'error')
@@ -163,4 +247,5 @@ def internal_error(error):
     return redirect(url_for('index'))
 
 if __name__ == '__main__':
+    warmup()
     app.run(host='0.0.0.0', port=5000, debug=True)
@@ -0,0 +1,26 @@
+import os
+
+# Gunicorn configuration
+# Requests mix CPU-bound C calls (sentiment inference, readability scoring,
+# PDF parsing) with waits on the OCR process pool and OpenAI HTTP calls.
+# gthread workers run each request on an OS thread; those calls release the
+# GIL, so one long inference only occupies its own thread instead of stalling
+# every request in the process the way it would stall a gevent hub, and no
+# monkey-patching of the libraries is needed.
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+worker_class = 'gthread'
+# Job status, lazily loaded text and suggestion streams are kept in process
+# memory unless REDIS_URL points the workers at a shared store
+workers = int(os.environ.get('GUNICORN_WORKERS', '4' if os.environ.get('REDIS_URL') else '1'))
+threads = int(os.environ.get('GUNICORN_THREADS', '8'))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '120'))
+
+def on_starting(server):
+    """Refuse to start several workers that cannot see each other's jobs"""
+    if server.cfg.workers > 1 and not os.environ.get('REDIS_URL'):
+        raise RuntimeError("REDIS_URL is required when running more than one Gunicorn worker")
+
+def post_worker_init(worker):
+    """Load models in each worker once the app is imported, before it serves"""
+    from app import warmup
+    warmup()
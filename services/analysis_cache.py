@@ -0,0 +1,153 @@
+import os
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+try:
+    import diskcache
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    DISKCACHE_AVAILABLE = False
+    diskcache = None
+from services import json_codec
+from services.redis_client import create_redis_client
+
+logger = logging.getLogger(__name__)
+
+class AnalysisCache:
+    """Service for caching analysis results by content hash"""
+    
+    def __init__(self, max_entries=1024, ttl_seconds=86400, namespace='analysis', cache_dir=None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.namespace = namespace
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.disk_cache = self.setup_disk_cache(cache_dir)
+        self.redis_client = create_redis_client()
+    
+    def setup_disk_cache(self, cache_dir):
+        """
+        Open the on-disk cache tier shared by processes on this host
+        
+        Args:
+            cache_dir (str): Base directory for disk caches, or None to disable
+            
+        Returns:
+            diskcache.Cache: Disk cache or None if disabled or unavailable
+        """
+        if not cache_dir:
+            return None
+        if not DISKCACHE_AVAILABLE:
+            logger.warning("diskcache library not available, disk cache disabled")
+            return None
+        
+        try:
+            size_limit = int(os.environ.get('DISK_CACHE_SIZE_MB', '1024')) * 1024 * 1024
+            return diskcache.Cache(os.path.join(cache_dir, self.namespace), size_limit=size_limit)
+        except Exception as e:
+            logger.error(f"Failed to open disk cache: {e}")
+            return None
+    
+    def make_key(self, text):
+        """
+        Build the cache key for a piece of text
+        
+        Args:
+            text (str): Text content
+            
+        Returns:
+            str: SHA-256 hex digest of the text
+        """
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+    
+    def get(self, key):
+        """
+        Look up cached analysis results
+        
+        Args:
+            key (str): Cache key from make_key
+            
+        Returns:
+            dict: Cached analysis results or None on a miss
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        
+        if self.disk_cache is not None:
+            try:
+                results = self.disk_cache.get(key)
+                if results is not None:
+                    self._remember(key, results)
+                    return results
+            except Exception as e:
+                logger.warning(f"Disk cache lookup failed: {str(e)}")
+        
+        if self.redis_client:
+            try:
+                cached = self.redis_client.get(f"{self.namespace}:{key}")
+                if cached:
+                    results = json_codec.loads(cached)
+                    self._remember(key, results)
+                    return results
+            except Exception as e:
+                logger.warning(f"Redis cache lookup failed: {str(e)}")
+        
+        return None
+    
+    def set(self, key, results):
+        """
+        Store analysis results in the cache
+        
+        Args:
+            key (str): Cache key from make_key
+            results (dict): Analysis results
+        """
+        self._remember(key, results)
+        
+        if self.disk_cache is not None:
+            try:
+                self.disk_cache.set(key, results, expire=self.ttl_seconds)
+            except Exception as e:
+                logger.warning(f"Disk cache store failed: {str(e)}")
+        
+        if self.redis_client:
+            try:
+                self.redis_client.setex(f"{self.namespace}:{key}", self.ttl_seconds, json_codec.dumps(results))
+            except Exception as e:
+                logger.warning(f"Redis cache store failed: {str(e)}")
+    
+    def get_or_analyze(self, text, analyze):
+        """
+        Return cached results for text, running the analysis on a miss
+        
+        Args:
+            text (str): Text content to analyze
+            analyze (callable): Function producing analysis results for text
+            
+        Returns:
+            dict: Analysis results
+        """
+        key = self.make_key(text)
+        results = self.get(key)
+        if results is not None:
+            logger.info(f"Analysis cache hit: {key[:12]}")
+            return results
+        
+        results = analyze(text)
+        
+        # Only cache complete analyses so failed or fallback steps are retried
+        if not results.get('error') and not results.get('degraded'):
+            self.set(key, results)
+        
+        return results
+    
+    def _remember(self, key, results):
+        """Store results in the in-process LRU, evicting the oldest entry"""
+        with self._lock:
+            self._entries[key] = results
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
@@ -1,17 +1,36 @@
 import os
+import hashlib
 import logging
-from werkzeug.utils import secure_filename
-import uuid
+import secrets
+from werkzeug.http import parse_options_header
+from werkzeug.sansio.multipart import Data, Epilogue, Field, File, MultipartDecoder, NeedData
 
 logger = logging.getLogger(__name__)
 
+# Leading bytes identifying each supported file type
+FILE_SIGNATURES = (
+    (b'%PDF-', 'pdf'),
+    (b'\x89PNG\r\n\x1a\n', 'png'),
+    (b'\xff\xd8\xff', 'jpg'),
+)
+
+# File type each accepted extension must contain, and its display name
+EXTENSION_FILE_TYPES = {'pdf': 'pdf', 'png': 'png', 'jpg': 'jpg', 'jpeg': 'jpg'}
+FILE_TYPE_NAMES = {'pdf': 'PDF', 'png': 'PNG', 'jpg': 'JPEG'}
+
+# Bytes needed to identify a file, up to the end of a JPEG APP0 "JFIF" marker
+HEADER_SIZE = 10
+
 class FileHandler:
     """Service for handling file uploads and validation"""
     
     def __init__(self, upload_folder, allowed_extensions):
         self.upload_folder = upload_folder
         self.allowed_extensions = allowed_extensions
+        self.allowed_suffixes = tuple(f".{ext}" for ext in allowed_extensions)
         self.max_file_size = 16 * 1024 * 1024  # 16MB
+        self.chunk_size = 64 * 1024  # 64KB read size for streamed uploads
+        self.spool_size = 8 * 1024 * 1024  # Larger uploads are spilled to disk
         
         # Ensure upload folder exists
         os.makedirs(upload_folder, exist_ok=True)
@@ -30,108 +49,206 @@ class FileHandler:
         if not filename:
             return False
         
-        return '.' in filename and \
-               filename.rsplit('.', 1)[1].lower() in self.allowed_extensions
+        return filename.lower().endswith(self.allowed_suffixes)
     
-    def validate_file(self, file):
+    def detect_file_type(self, header):
         """
-        Validate uploaded file
+        Identify a file from its magic bytes
         
         Args:
-            file: FileStorage object from Flask request
+            header (bytes): First HEADER_SIZE bytes of the file
             
         Returns:
-            tuple: (is_valid, error_message)
+            str: 'pdf', 'png' or 'jpg', or None if unrecognized
         """
-        try:
-            # Check if file exists
-            if not file or file.filename == '':
-                return False, "No file provided"
-            
-            # Check file extension
-            if not self.is_allowed_file(file.filename):
-                return False, f"Invalid file type. Allowed types: {', '.join(self.allowed_extensions)}"
-            
-            # Check file size (if possible)
-            if hasattr(file, 'content_length') and file.content_length:
-                if file.content_length > self.max_file_size:
-                    return False, f"File too large. Maximum size: {self.max_file_size // (1024*1024)}MB"
-            
-            # Check file content by reading a small portion
-            file.seek(0)
-            header = file.read(1024)  # Read first 1KB
-            file.seek(0)  # Reset file pointer
-            
-            if not header:
-                return False, "File appears to be empty"
-            
-            # Basic file type validation based on headers
-            file_extension = file.filename.rsplit('.', 1)[1].lower()
-            
-            if file_extension == 'pdf' and not header.startswith(b'%PDF'):
-                return False, "File does not appear to be a valid PDF"
-            
-            if file_extension in ['jpg', 'jpeg'] and not (header.startswith(b'\xff\xd8\xff') or b'JFIF' in header[:20]):
-                return False, "File does not appear to be a valid JPEG"
-            
-            if file_extension == 'png' and not header.startswith(b'\x89PNG\r\n\x1a\n'):
-                return False, "File does not appear to be a valid PNG"
-            
-            return True, "File is valid"
+        for signature, file_type in FILE_SIGNATURES:
+            if header[:len(signature)] == signature:
+                return file_type
+        
+        # Some JPEG writers are only recognizable by the JFIF marker in APP0
+        if header[6:10] == b'JFIF':
+            return 'jpg'
+        return None
+    
+    def validate_header(self, header, filename):
+        """
+        Check a file's magic bytes against the type its extension declares
+        
+        Args:
+            header (bytes): First HEADER_SIZE bytes of the file
+            filename (str): Uploaded file name with an allowed extension
             
-        except Exception as e:
-            logger.error(f"File validation error: {str(e)}")
-            return False, f"File validation failed: {str(e)}"
+        Returns:
+            tuple: (file_type, error_message); file_type is None if invalid
+        """
+        file_type = self.detect_file_type(header)
+        if file_type is None:
+            return None, "File content is not a PDF, PNG or JPEG"
+        
+        expected_type = EXTENSION_FILE_TYPES[filename.rsplit('.', 1)[-1].lower()]
+        if file_type != expected_type:
+            return None, f"File does not appear to be a valid {FILE_TYPE_NAMES[expected_type]}"
+        
+        return file_type, None
     
-    def save_file(self, file):
+    def stream_upload(self, stream, content_type, field_name='file'):
         """
-        Save uploaded file to upload directory
+        Stream a multipart upload into memory, spilling large files to disk
+        
+        The request body is fed through Werkzeug's incremental multipart
+        decoder. The file type is taken from the magic bytes of the first
+        chunk and must match the file name's extension, so uploads that are
+        not really the PDF, PNG or JPEG they claim to be are dropped before
+        anything is buffered further. The file part is kept
+        in memory so extractors can read it without a disk round-trip; only
+        uploads larger than spool_size are written to the upload directory.
         
         Args:
-            file: FileStorage object from Flask request
+            stream: Raw request body stream
+            content_type (str): Content-Type header of the request
+            field_name (str): Form field carrying the file
             
         Returns:
-            str: Saved filename or None if failed
+            tuple: (original_filename, upload, error_message). original_filename
+                   is None if no file was sent; upload is None if the file was
+                   rejected or could not be read, otherwise a dict with 'source'
+                   (bytes or file path), 'path', 'extension', 'size' and
+                   'sha256' (hex digest of the file content). error_message
+                   explains why the content was rejected, and is None for
+                   read failures
         """
+        mimetype, options = parse_options_header(content_type or '')
+        boundary = options.get('boundary')
+        if mimetype != 'multipart/form-data' or not boundary:
+            logger.error(f"Unsupported upload content type: {mimetype}")
+            return None, None, None
+        
+        decoder = MultipartDecoder(boundary.encode('latin-1'))
+        original_filename = None
+        file_extension = None
+        buffer = None
+        in_file_part = False
+        filepath = None
+        target = None
+        file_size = 0
+        digest = hashlib.sha256()
+        error_msg = None
+        
         try:
-            # Validate file first
-            is_valid, error_msg = self.validate_file(file)
-            if not is_valid:
-                logger.error(f"File validation failed: {error_msg}")
-                return None
-            
-            # Generate unique filename
-            original_filename = secure_filename(file.filename)
-            file_extension = original_filename.rsplit('.', 1)[1].lower()
-            unique_filename = f"{uuid.uuid4().hex}.{file_extension}"
+            while True:
+                chunk = stream.read(self.chunk_size)
+                decoder.receive_data(chunk or None)
+                
+                event = decoder.next_event()
+                while not isinstance(event, (Epilogue, NeedData)):
+                    if isinstance(event, (Field, File)):
+                        # Data events belong to the most recent part header
+                        in_file_part = False
+                        if isinstance(event, File) and event.name == field_name and original_filename is None:
+                            original_filename = event.filename or ''
+                            if self.is_allowed_file(original_filename):
+                                buffer = bytearray()
+                                in_file_part = True
+                    
+                    elif isinstance(event, Data) and in_file_part and error_msg is None:
+                        file_size += len(event.data)
+                        if file_size > self.max_file_size:
+                            error_msg = f"File too large. Maximum size: {self.max_file_size // (1024*1024)}MB"
+                        elif target is not None:
+                            digest.update(event.data)
+                            self._write_all(target, event.data)
+                        else:
+                            digest.update(event.data)
+                            buffer += event.data
+                            if file_extension is None and len(buffer) >= HEADER_SIZE:
+                                file_extension, error_msg = self.validate_header(buffer[:HEADER_SIZE], original_filename)
+                                if error_msg:
+                                    del buffer[:]
+                            
+                            if error_msg is None and len(buffer) > self.spool_size:
+                                # Spill to disk once the upload gets large; the buffer
+                                # and later chunks go to the descriptor without a
+                                # userspace write buffer in between
+                                filepath = f"{self.upload_folder}/{secrets.token_urlsafe(16)}.{file_extension}"
+                                target = os.open(filepath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+                                self._write_all(target, buffer)
+                                del buffer[:]
+                        
+                        if not event.more_data:
+                            in_file_part = False
+                            if target is not None:
+                                os.close(target)
+                                target = None
+                    
+                    event = decoder.next_event()
+                
+                if not chunk:
+                    break
             
-            # Save file
-            filepath = os.path.join(self.upload_folder, unique_filename)
-            file.save(filepath)
+            if buffer is None:
+                return original_filename, None, None
             
-            # Verify file was saved successfully
-            if not os.path.exists(filepath):
-                logger.error(f"File was not saved successfully: {filepath}")
-                return None
+            if error_msg is None and file_extension is None:
+                if not buffer:
+                    error_msg = "File appears to be empty"
+                else:
+                    file_extension, error_msg = self.validate_header(buffer[:HEADER_SIZE], original_filename)
             
-            # Check saved file size
-            file_size = os.path.getsize(filepath)
-            if file_size == 0:
-                logger.error(f"Saved file is empty: {filepath}")
-                self.cleanup_file(filepath)
-                return None
+            if error_msg:
+                logger.error(f"File validation failed: {error_msg}")
+                if filepath:
+                    self.cleanup_file(filepath)
+                return original_filename, None, error_msg
             
-            if file_size > self.max_file_size:
-                logger.error(f"Saved file exceeds size limit: {file_size} bytes")
-                self.cleanup_file(filepath)
-                return None
+            if filepath:
+                logger.info(f"Upload spooled to disk: {os.path.basename(filepath)} ({file_size} bytes)")
+            else:
+                logger.info(f"Upload received in memory ({file_size} bytes)")
             
-            logger.info(f"File saved successfully: {unique_filename} ({file_size} bytes)")
-            return unique_filename
+            return original_filename, {
+                'source': filepath or buffer,
+                'path': filepath,
+                'extension': file_extension,
+                'size': file_size,
+                'sha256': digest.hexdigest()
+            }, None
             
         except Exception as e:
-            logger.error(f"Error saving file: {str(e)}")
-            return None
+            logger.error(f"Error streaming upload: {str(e)}")
+            if filepath:
+                self.cleanup_file(filepath)
+            return original_filename, None, None
+            
+        finally:
+            if target is not None:
+                os.close(target)
+    
+    def _write_all(self, fd, data):
+        """
+        Write a bytes-like object to a file descriptor without copying it
+        
+        Args:
+            fd (int): Open file descriptor
+            data (bytes or bytearray): Data to write
+        """
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    
+    def discard_upload(self, upload):
+        """
+        Release an upload returned by stream_upload
+        
+        Args:
+            upload (dict): Upload returned by stream_upload
+        """
+        if not upload:
+            return
+        
+        # Drop the in-memory buffer so it can be freed while analysis runs
+        upload['source'] = None
+        if upload['path']:
+            self.cleanup_file(upload['path'])
     
     def cleanup_file(self, filepath):
         """
@@ -196,21 +313,21 @@ class FileHandler:
                 return
             
             cleaned_count = 0
-            for filename in os.listdir(self.upload_folder):
-                if filename.startswith('.'):  # Skip hidden files
-                    continue
-                
-                filepath = os.path.join(self.upload_folder, filename)
-                
-                try:
-                    file_age = current_time - os.path.getmtime(filepath)
-                    if file_age > max_age_seconds:
-                        os.remove(filepath)
-                        cleaned_count += 1
-                        logger.debug(f"Cleaned up old file: {filename}")
-                        
-                except Exception as file_error:
-                    logger.warning(f"Could not clean up file {filename}: {str(file_error)}")
+            # scandir entries carry their own stat results, saving a path lookup per file
+            with os.scandir(self.upload_folder) as entries:
+                for entry in entries:
+                    if entry.name.startswith('.'):  # Skip hidden files
+                        continue
+                    
+                    try:
+                        file_age = current_time - entry.stat().st_mtime
+                        if file_age > max_age_seconds:
+                            os.remove(entry.path)
+                            cleaned_count += 1
+                            logger.debug(f"Cleaned up old file: {entry.name}")
+                            
+                    except Exception as file_error:
+                        logger.warning(f"Could not clean up file {entry.name}: {str(file_error)}")
             
             if cleaned_count > 0:
                 logger.info(f"Cleaned up {cleaned_count} old files")
@@ -0,0 +1,97 @@
+import time
+import uuid
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from services import json_codec
+from services.redis_client import create_redis_client
+
+logger = logging.getLogger(__name__)
+
+class JobQueue:
+    """Service for running upload processing in the background"""
+    
+    def __init__(self, max_workers=4, ttl_seconds=3600):
+        self.ttl_seconds = ttl_seconds
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='upload-job')
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self.redis_client = create_redis_client()
+    
+    def enqueue(self, func, *args):
+        """
+        Run a function in the background
+        
+        Args:
+            func (callable): Function to run; its return value becomes the job result
+            *args: Arguments passed to func
+            
+        Returns:
+            str: Job id for get_status
+        """
+        self._prune()
+        
+        job_id = uuid.uuid4().hex
+        self._update(job_id, {'status': 'queued'})
+        self.executor.submit(self._run, job_id, func, args)
+        
+        logger.info(f"Job queued: {job_id}")
+        return job_id
+    
+    def get_status(self, job_id):
+        """
+        Get the status of a job
+        
+        Args:
+            job_id (str): Job id returned by enqueue
+            
+        Returns:
+            dict: Job status ('queued', 'started', 'finished' or 'failed'),
+                  with 'result' or 'error' once done; None if unknown
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None:
+            return job
+        
+        if self.redis_client:
+            try:
+                cached = self.redis_client.get(f"job:{job_id}")
+                if cached:
+                    return json_codec.loads(cached)
+            except Exception as e:
+                logger.warning(f"Redis job lookup failed: {str(e)}")
+        
+        return None
+    
+    def _run(self, job_id, func, args):
+        """Execute a job and record its outcome"""
+        self._update(job_id, {'status': 'started'})
+        try:
+            result = func(*args)
+            self._update(job_id, {'status': 'finished', 'result': result})
+            logger.info(f"Job finished: {job_id}")
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {str(e)}")
+            self._update(job_id, {'status': 'failed', 'error': str(e)})
+    
+    def _update(self, job_id, job):
+        """Store job state locally and, when configured, in Redis"""
+        job['job_id'] = job_id
+        job['updated_at'] = time.time()
+        with self._lock:
+            self._jobs[job_id] = job
+        
+        if self.redis_client:
+            try:
+                self.redis_client.setex(f"job:{job_id}", self.ttl_seconds, json_codec.dumps(job))
+            except Exception as e:
+                logger.warning(f"Redis job store failed: {str(e)}")
+    
+    def _prune(self):
+        """Forget jobs that have not changed within the TTL"""
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            expired = [job_id for job_id, job in self._jobs.items() if job['updated_at'] < cutoff]
+            for job_id in expired:
+                del self._jobs[job_id]
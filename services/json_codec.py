@@ -0,0 +1,39 @@
+import json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
+def dumps(obj):
+    """
+    Serialize an object to a JSON string, using orjson when available
+    
+    Args:
+        obj: JSON-serializable object
+        
+    Returns:
+        str: JSON text
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj).decode('utf-8')
+        except TypeError:
+            # orjson rejects some types the stdlib accepts (e.g. non-str keys)
+            pass
+    return json.dumps(obj)
+
+def loads(data):
+    """
+    Parse JSON text, using orjson when available
+    
+    Args:
+        data (str | bytes): JSON text
+        
+    Returns:
+        object: Parsed value
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
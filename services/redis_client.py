@@ -0,0 +1,33 @@
+import os
+import logging
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+def create_redis_client():
+    """
+    Create a Redis client from REDIS_URL
+    
+    Returns:
+        redis.Redis: Client, or None if REDIS_URL is unset or redis is unavailable
+    """
+    redis_url = os.environ.get("REDIS_URL")
+    if not redis_url:
+        return None
+    
+    if not REDIS_AVAILABLE:
+        logger.warning("REDIS_URL is set but the redis library is not available, using in-process storage only")
+        return None
+    
+    try:
+        client = redis.Redis.from_url(redis_url)
+        logger.info("Redis client initialized successfully")
+        return client
+    except Exception as e:
+        logger.error(f"Failed to initialize Redis client: {e}")
+        return None
@@ -0,0 +1,197 @@
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+try:
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+    SENTENCE_TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    SENTENCE_TRANSFORMERS_AVAILABLE = False
+    np = None
+    SentenceTransformer = None
+try:
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+    faiss = None
+
+logger = logging.getLogger(__name__)
+
+class SemanticCache:
+    """Service for reusing analysis results across near-duplicate documents"""
+    
+    def __init__(self, threshold=0.95, max_entries=10000, ttl_seconds=86400):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.window_chars = 1000  # Characters per embedded window
+        self.max_windows = 8  # Long documents are sampled at evenly spread windows
+        self._entries = OrderedDict()  # entry id -> (expires_at, results), least recently used first
+        self._vectors = {}  # entry id -> vector, when faiss is unavailable
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self.encoder = None
+        self.index = None
+        self._encoder_loaded = False
+        self._encoder_lock = threading.Lock()
+    
+    def setup_encoder(self):
+        """Initialize sentence embedding model and vector index"""
+        self.index = None
+        if not SENTENCE_TRANSFORMERS_AVAILABLE:
+            logger.info("sentence-transformers not available, semantic cache disabled")
+            self.encoder = None
+            return
+        
+        try:
+            model_name = os.environ.get("SEMANTIC_CACHE_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+            self.encoder = SentenceTransformer(model_name)
+            if FAISS_AVAILABLE:
+                # Inner product over L2-normalized vectors is cosine similarity
+                # The id map lets evicted entries be removed from the index
+                self.index = faiss.IndexIDMap(faiss.IndexFlatIP(self.encoder.get_sentence_embedding_dimension()))
+            logger.info(f"Semantic cache initialized with {model_name}")
+        except Exception as e:
+            logger.error(f"Failed to initialize semantic cache: {e}")
+            self.encoder = None
+    
+    @property
+    def enabled(self):
+        return self._get_encoder() is not None
+    
+    def _get_encoder(self):
+        """Load the embedding model on first use"""
+        if not self._encoder_loaded:
+            with self._encoder_lock:
+                if not self._encoder_loaded:
+                    self.setup_encoder()
+                    self._encoder_loaded = True
+        return self.encoder
+    
+    def warmup(self):
+        """Load the embedding model before the first request"""
+        self._get_encoder()
+    
+    def lookup(self, text):
+        """
+        Find the analysis of a previously seen, near-identical document
+        
+        Args:
+            text (str): Text content
+            
+        Returns:
+            dict: Cached analysis results or None if nothing is similar enough
+        """
+        if not self.enabled:
+            return None
+        
+        try:
+            vector = self._encode(text)
+            with self._lock:
+                if not self._entries:
+                    return None
+                
+                if self.index is not None:
+                    scores, ids = self.index.search(vector.reshape(1, -1), 1)
+                    best_score, best_id = float(scores[0][0]), int(ids[0][0])
+                else:
+                    entry_ids = list(self._vectors)
+                    similarities = np.vstack([self._vectors[entry_id] for entry_id in entry_ids]) @ vector
+                    best = int(similarities.argmax())
+                    best_score, best_id = float(similarities[best]), entry_ids[best]
+                
+                if best_score >= self.threshold and best_id in self._entries:
+                    expires_at, results = self._entries[best_id]
+                    if expires_at < time.time():
+                        self._forget(best_id)
+                        return None
+                    
+                    self._entries.move_to_end(best_id)
+                    logger.info(f"Semantic cache hit (similarity {best_score:.3f})")
+                    return results
+                    
+        except Exception as e:
+            logger.warning(f"Semantic cache lookup failed: {str(e)}")
+        
+        return None
+    
+    def store(self, text, results):
+        """
+        Remember analysis results for a document
+        
+        Args:
+            text (str): Text content
+            results (dict): Analysis results
+        """
+        if not self.enabled:
+            return
+        
+        try:
+            vector = self._encode(text)
+            with self._lock:
+                # Evict the least recently used entries once full
+                while len(self._entries) >= self.max_entries:
+                    self._forget(next(iter(self._entries)))
+                
+                entry_id = self._next_id
+                self._next_id += 1
+                if self.index is not None:
+                    self.index.add_with_ids(vector.reshape(1, -1), np.array([entry_id], dtype=np.int64))
+                else:
+                    self._vectors[entry_id] = vector
+                self._entries[entry_id] = (time.time() + self.ttl_seconds, results)
+                
+        except Exception as e:
+            logger.warning(f"Semantic cache store failed: {str(e)}")
+    
+    def get_or_analyze(self, text, analyze, refresh=None):
+        """
+        Return results for a near-duplicate document, running the analysis otherwise
+        
+        Args:
+            text (str): Text content to analyze
+            analyze (callable): Function producing analysis results for text
+            refresh (callable): Optional function (text, cached_results) -> results
+                                recomputing the parts of a neighbour's results
+                                that depend on the exact text
+                                
+        Returns:
+            dict: Analysis results
+        """
+        results = self.lookup(text)
+        if results is not None:
+            return refresh(text, results) if refresh else results
+        
+        results = analyze(text)
+        # Degraded results would be served to every similar document, so only complete ones are kept
+        if not results.get('error') and not results.get('degraded'):
+            self.store(text, results)
+        
+        return results
+    
+    def _forget(self, entry_id):
+        """Drop an entry and its vector (caller holds the lock)"""
+        del self._entries[entry_id]
+        if self.index is not None:
+            self.index.remove_ids(np.array([entry_id], dtype=np.int64))
+        else:
+            del self._vectors[entry_id]
+    
+    def _encode(self, text):
+        """Embed windows spread across a document as one L2-normalized float32 vector"""
+        windows = self._sample_windows(text)
+        vectors = self.encoder.encode(windows, normalize_embeddings=True)
+        vector = np.asarray(vectors, dtype=np.float32).mean(axis=0)
+        return vector / max(float(np.linalg.norm(vector)), 1e-12)
+    
+    def _sample_windows(self, text):
+        """Cover text with up to max_windows full-length windows spaced evenly from start to end"""
+        count = min(self.max_windows, -(-len(text) // self.window_chars))
+        if count <= 1:
+            return [text[:self.window_chars]]
+        
+        step = (len(text) - self.window_chars) / (count - 1)
+        return [text[round(i * step):round(i * step) + self.window_chars] for i in range(count)]
@@ -1,55 +1,394 @@
+import io
 import os
+import asyncio
+import mmap
+import hashlib
 import logging
+import tempfile
+import multiprocessing
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
 import fitz  # PyMuPDF
 import pytesseract
-from PIL import Image
+from PIL import Image, ImageOps
+try:
+    import tesserocr
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    TESSEROCR_AVAILABLE = False
+    tesserocr = None
+try:
+    import numpy as np
+except ImportError:
+    np = None
+try:
+    import cv2
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+    cv2 = None
+from services.analysis_cache import AnalysisCache
 
 logger = logging.getLogger(__name__)
 
+# Formats PIL tries when opening images, instead of probing every plugin
+IMAGE_FORMATS = ('JPEG', 'PNG', 'TIFF', 'BMP', 'WEBP')
+
+# 'tesseract' (default) or 'paddle' for PaddleOCR
+OCR_BACKEND = os.environ.get('OCR_BACKEND', 'tesseract').lower()
+
+# Run PaddleOCR on the GPU; needs a CUDA build of paddlepaddle
+OCR_USE_GPU = os.environ.get('OCR_USE_GPU', '0') == '1'
+
+# Paddle is slow to import, so PaddleOCR is only loaded when selected.
+# The engine uses the PaddleOCR 2.x API (paddleocr<3): 3.x replaced
+# use_gpu/cls with device/predict
+PADDLEOCR_AVAILABLE = False
+PaddleOCR = None
+if OCR_BACKEND == 'paddle':
+    try:
+        import paddleocr
+        from paddleocr import PaddleOCR
+        paddleocr_version = getattr(paddleocr, '__version__', '2')
+        if int(paddleocr_version.split('.')[0]) < 3:
+            PADDLEOCR_AVAILABLE = True
+        else:
+            logger.warning(f"paddleocr {paddleocr_version} is not supported (needs paddleocr<3), using Tesseract")
+    except (ImportError, ValueError):
+        logger.warning("paddleocr library not available, using Tesseract")
+
+OCR_WHITELIST = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz .,!?@#$%^&*()_+-=[]{}|;:<>'
+OCR_CONFIG = f'--oem 3 --psm 6 -c tessedit_char_whitelist={OCR_WHITELIST}'
+
+# One in-process Tesseract API per process; the API is not thread-safe
+_tess_api = None
+_tess_lock = threading.Lock()
+
+def _get_tess_api():
+    """Create the process-wide tesserocr API on first use"""
+    global _tess_api
+    if _tess_api is None:
+        api = tesserocr.PyTessBaseAPI(lang='eng', psm=tesserocr.PSM.SINGLE_BLOCK, oem=tesserocr.OEM.DEFAULT)
+        api.SetVariable('tessedit_char_whitelist', OCR_WHITELIST)
+        _tess_api = api
+    return _tess_api
+
+# Tesseract binary version, checked once per process; '' if the check failed
+_tesseract_version = None
+
+def _get_tesseract_version():
+    """
+    Check the Tesseract binary once per process
+    
+    Returns:
+        str: Tesseract version, or None if it is missing or unusable
+    """
+    global _tesseract_version
+    if _tesseract_version is None:
+        try:
+            _tesseract_version = str(pytesseract.get_tesseract_version())
+        except (Exception, SystemExit) as e:
+            # pytesseract raises SystemExit for unsupported versions
+            logger.warning(f"Tesseract setup warning: {e}")
+            _tesseract_version = ''
+    return _tesseract_version or None
+
+def _run_tesseract(image):
+    """
+    Run Tesseract on a PIL image
+    
+    Uses the resident tesserocr API when available, so the language model
+    is loaded once per process instead of once per call, and falls back to
+    the pytesseract subprocess wrapper otherwise.
+    
+    Args:
+        image: PIL Image object
+        
+    Returns:
+        str: Raw OCR text
+    """
+    if TESSEROCR_AVAILABLE:
+        with _tess_lock:
+            api = _get_tess_api()
+            api.SetImage(image)
+            return api.GetUTF8Text().strip()
+    
+    return pytesseract.image_to_string(image, config=OCR_CONFIG, lang='eng').strip()
+
+def _run_tesseract_batch(images):
+    """
+    Run one Tesseract subprocess over several PIL images
+    
+    Tesseract accepts a text file listing images and writes their text as
+    form-feed separated pages, so its start-up cost (language model load)
+    is paid once per batch rather than once per image.
+    
+    Args:
+        images (list): PIL Image objects
+        
+    Returns:
+        list: Raw OCR text per image
+    """
+    with tempfile.TemporaryDirectory(prefix='ocr-batch-') as tmp_dir:
+        image_paths = []
+        for index, image in enumerate(images):
+            image_path = os.path.join(tmp_dir, f"{index}.png")
+            image.save(image_path)
+            image_paths.append(image_path)
+        
+        list_path = os.path.join(tmp_dir, 'images.txt')
+        with open(list_path, 'w') as list_file:
+            list_file.write('\n'.join(image_paths) + '\n')
+        
+        output_base = os.path.join(tmp_dir, 'output')
+        pytesseract.pytesseract.run_tesseract(list_path, output_base, extension='txt', lang='eng', config=OCR_CONFIG)
+        with open(f"{output_base}.txt", encoding='utf-8') as output_file:
+            pages = output_file.read().split('\f')
+    
+    # Every page, including the last, is followed by a form feed
+    if len(pages) != len(images) + 1:
+        raise RuntimeError(f"Tesseract returned {len(pages) - 1} pages for {len(images)} images")
+    return [page.strip() for page in pages[:-1]]
+
+# One PaddleOCR engine per process; inference on it is not thread-safe
+_paddle_ocr = None
+_paddle_lock = threading.Lock()
+
+def _run_paddle_ocr(image):
+    """
+    Run PaddleOCR on a PIL image
+    
+    Args:
+        image: PIL Image object
+        
+    Returns:
+        str: Raw OCR text, one recognized line per line
+    """
+    global _paddle_ocr
+    with _paddle_lock:
+        if _paddle_ocr is None:
+            _paddle_ocr = PaddleOCR(use_angle_cls=True, lang='en', use_gpu=OCR_USE_GPU, show_log=False)
+        
+        pixels = np.asarray(image.convert('L') if image.mode == '1' else image)
+        result = _paddle_ocr.ocr(pixels, cls=True)
+    
+    # One result per input image; None when no text was detected
+    lines = result[0] if result and result[0] else []
+    return '\n'.join(line[1][0] for line in lines).strip()
+
+def _run_ocr(image):
+    """Run the configured OCR backend on a PIL image, returning raw text"""
+    if OCR_BACKEND == 'paddle' and PADDLEOCR_AVAILABLE:
+        return _run_paddle_ocr(image)
+    return _run_tesseract(image)
+
+# Scanned PDF pages are OCR'd, and long PDFs' text layers read, in parallel
+# across worker processes
+OCR_WORKERS = int(os.environ.get('OCR_WORKERS', os.cpu_count() or 1))
+_ocr_pool = None
+_ocr_pool_lock = threading.Lock()
+
+def _init_ocr_worker():
+    """Give each OCR worker process its own Tesseract API"""
+    global _tess_api, _tess_lock
+    _tess_api = None
+    _tess_lock = threading.Lock()
+
+def _ocr_worker(image):
+    """OCR a single page image, returning an empty string on failure"""
+    try:
+        return _run_ocr(image)
+    except Exception as e:
+        logger.warning(f"OCR failed for page image: {str(e)}")
+        return ""
+
+@contextmanager
+def _open_pdf(source):
+    """
+    Open a PDF from a path or raw bytes without copying it
+    
+    PyMuPDF copies bytearray streams into bytes, so in-memory uploads are
+    handed over as a memoryview. Files are memory-mapped, so processes
+    reading the same upload share its pages in the kernel page cache; the
+    mapping is unmapped once the document is closed.
+    
+    Args:
+        source (str or bytes): Path to PDF file or its raw bytes
+        
+    Yields:
+        fitz.Document: Open document, closed when the block exits
+    """
+    if isinstance(source, (bytes, bytearray)):
+        with fitz.open(stream=memoryview(source), filetype="pdf") as doc:
+            yield doc
+        return
+    
+    with open(source, 'rb') as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            mapped = None
+    
+    if mapped is None:
+        # Empty files cannot be mapped; let PyMuPDF report the error
+        with fitz.open(source) as doc:
+            yield doc
+        return
+    
+    view = memoryview(mapped)
+    try:
+        with fitz.open(stream=view, filetype="pdf") as doc:
+            yield doc
+    finally:
+        # The mapping cannot be closed while the view over it is exported
+        view.release()
+        mapped.close()
+
+def _page_text_worker(source, start, stop):
+    """
+    Read the text layer of a range of PDF pages in a worker process
+    
+    Args:
+        source (str or bytes): Path to PDF file or its raw bytes
+        start (int): First zero-based page number
+        stop (int): Page number to stop before
+        
+    Returns:
+        list: Text of each page in the range
+    """
+    with _open_pdf(source) as doc:
+        return [page.get_text() for page in doc.pages(start, stop)]
+
+def _get_ocr_pool():
+    """Create the shared OCR process pool on first use"""
+    global _ocr_pool
+    with _ocr_pool_lock:
+        if _ocr_pool is None:
+            # Workers start from a single-threaded fork server rather than a
+            # fork of this (threaded) process, with the OCR libraries already
+            # imported there. The worker entry points live in this module, so
+            # starting them never imports app; only the __main__ script is
+            # re-run, and app.py keeps model loading in warmup() for that.
+            if 'forkserver' in multiprocessing.get_all_start_methods():
+                mp_context = multiprocessing.get_context('forkserver')
+                mp_context.set_forkserver_preload(['fitz', 'pytesseract', 'PIL.Image'])
+            else:
+                mp_context = None
+            _ocr_pool = ProcessPoolExecutor(
+                max_workers=OCR_WORKERS, mp_context=mp_context, initializer=_init_ocr_worker
+            )
+    return _ocr_pool
+
 class TextExtractor:
     """Service for extracting text from various file formats"""
     
     def __init__(self):
+        # PDFs averaging fewer characters per page than this are treated as
+        # scans; their pages below the OCR threshold are sent through OCR
+        self.pdf_text_min_chars = 100
+        self.pdf_ocr_threshold = 25
+        
+        # Shorter PDFs are read in-process; below this the cost of shipping
+        # the document to worker processes outweighs the parallel speedup
+        self.pdf_parallel_min_pages = 16
+        
+        # Tesseract accuracy peaks around 300 DPI; higher only adds pixels
+        self.ocr_dpi = 300
+        
+        # Larger uploaded images are scaled down to this longest side; OCR time
+        # grows with pixel count while text this large is already legible
+        self.ocr_max_side = 2000
+        
+        # OCR text keyed by a hash of the page or image pixels
+        self.ocr_cache = AnalysisCache(
+            max_entries=512, namespace='ocr', cache_dir=os.environ.get('ANALYSIS_CACHE_DIR')
+        )
+        
         self.setup_tesseract()
     
     def setup_tesseract(self):
         """Configure tesseract OCR"""
         try:
+            if TESSEROCR_AVAILABLE:
+                with _tess_lock:
+                    _get_tess_api()
+                logger.info("Tesseract OCR is available in-process via tesserocr")
+                return
+            
             # Try to use tesseract from system
-            pytesseract.get_tesseract_version()
-            logger.info("Tesseract OCR is available")
+            version = _get_tesseract_version()
+            if version:
+                logger.info(f"Tesseract OCR {version} is available")
         except Exception as e:
             logger.warning(f"Tesseract setup warning: {e}")
     
-    def extract_from_pdf(self, filepath):
+    def warmup(self):
+        """Load the OCR engine's models before the first request"""
+        if OCR_BACKEND == 'paddle' and PADDLEOCR_AVAILABLE:
+            try:
+                _run_paddle_ocr(Image.new('L', (32, 32), 255))
+                logger.info("PaddleOCR warmed up")
+            except Exception as e:
+                logger.warning(f"PaddleOCR warmup failed: {e}")
+            return
+        
+        if not TESSEROCR_AVAILABLE:
+            # pytesseract starts a fresh process per call; nothing to preload
+            return
+        
+        try:
+            with _tess_lock:
+                api = _get_tess_api()
+                api.SetImage(Image.new('L', (32, 32), 255))
+                api.GetUTF8Text()
+            logger.info("Tesseract OCR warmed up")
+        except Exception as e:
+            logger.warning(f"Tesseract warmup failed: {e}")
+    
+    def extract_from_pdf(self, source):
         """
         Extract text from PDF file using PyMuPDF
         
+        The embedded text layer is read first. Born-digital PDFs are returned
+        straight away; only pages with little or no text layer (scans) are
+        rasterized and sent through OCR.
+        
         Args:
-            filepath (str): Path to PDF file
+            source (str or bytes): Path to PDF file or its raw bytes
             
         Returns:
             str: Extracted text content
         """
         try:
-            if not os.path.exists(filepath):
-                raise FileNotFoundError(f"PDF file not found: {filepath}")
+            in_memory = isinstance(source, (bytes, bytearray))
+            if not in_memory and not os.path.exists(source):
+                raise FileNotFoundError(f"PDF file not found: {source}")
             
             text_content = []
             
             # Open PDF document
-            with fitz.open(filepath) as doc:
+            with _open_pdf(source) as doc:
                 logger.info(f"Processing PDF with {len(doc)} pages")
                 
-                for page_num in range(len(doc)):
-                    page = doc[page_num]
-                    text = page.get_text()
-                    
-                    if text.strip():
+                # Each page is stripped once; the checks and join below reuse it
+                page_texts = [text.strip() for text in self._read_text_layer(doc, source)]
+                total_chars = sum(len(text) for text in page_texts)
+                needs_ocr = total_chars < self.pdf_text_min_chars * max(len(doc), 1)
+                
+                if needs_ocr:
+                    ocr_pages = [page_num for page_num, text in enumerate(page_texts)
+                                 if len(text) < self.pdf_ocr_threshold]
+                    for page_num, text in zip(ocr_pages, self._ocr_pdf_pages(doc, ocr_pages)):
+                        if text:
+                            page_texts[page_num] = text
+                
+                for page_num, text in enumerate(page_texts):
+                    if text:
                         text_content.append(text)
                         logger.debug(f"Extracted {len(text)} characters from page {page_num + 1}")
             
-            full_text = "\n\n".join(text_content).strip()
+            full_text = "\n\n".join(text_content)
             
             if not full_text:
                 logger.warning("No text extracted from PDF")
@@ -59,55 +398,287 @@ class TextExtractor:
             return full_text
             
         except Exception as e:
-            logger.error(f"Error extracting text from PDF {filepath}: {str(e)}")
+            logger.error(f"Error extracting text from PDF {self._describe(source)}: {str(e)}")
             raise Exception(f"Failed to extract text from PDF: {str(e)}")
     
-    def extract_from_image(self, filepath):
+    async def aextract_from_pdf(self, source):
+        """
+        Extract text from a PDF without blocking the event loop
+        
+        Args:
+            source (str or bytes): Path to PDF file or its raw bytes
+            
+        Returns:
+            str: Extracted text content
+        """
+        return await asyncio.to_thread(self.extract_from_pdf, source)
+    
+    def _read_text_layer(self, doc, source):
+        """
+        Read the embedded text of every PDF page
+        
+        Long documents are split into one contiguous page range per worker
+        and read on the shared process pool, since PyMuPDF holds the GIL.
+        
+        Args:
+            doc: PyMuPDF document
+            source (str or bytes): Path to PDF file or its raw bytes
+            
+        Returns:
+            list: Text per page
+        """
+        page_count = len(doc)
+        if page_count >= self.pdf_parallel_min_pages and OCR_WORKERS > 1:
+            step = -(-page_count // OCR_WORKERS)
+            try:
+                futures = [
+                    _get_ocr_pool().submit(_page_text_worker, source, start, min(start + step, page_count))
+                    for start in range(0, page_count, step)
+                ]
+                return [text for future in futures for text in future.result()]
+            except Exception as e:
+                logger.warning(f"Parallel PDF text extraction failed, reading sequentially: {str(e)}")
+        
+        return [page.get_text() for page in doc]
+    
+    def _ocr_pdf_pages(self, doc, page_numbers):
+        """
+        Rasterize PDF pages and extract their text using OCR
+        
+        Pages are OCR'd in parallel on the shared process pool, in batches
+        so only a few rendered pages are held in memory at once.
+        
+        Args:
+            doc: PyMuPDF document
+            page_numbers (list): Zero-based numbers of the pages to OCR
+            
+        Returns:
+            list: Cleaned OCR text per page, empty where OCR failed
+        """
+        if not page_numbers:
+            return []
+        
+        logger.info(f"Running OCR on {len(page_numbers)} PDF pages with {OCR_WORKERS} workers")
+        
+        texts = []
+        batch_size = max(OCR_WORKERS, 1) * 2
+        for start in range(0, len(page_numbers), batch_size):
+            images = []
+            for page_num in page_numbers[start:start + batch_size]:
+                images.append(self._render_page_for_ocr(doc[page_num]))
+            
+            # Only pages not seen before are sent to Tesseract
+            keys = [self._ocr_cache_key(image) for image in images]
+            batch_texts = [self._cached_ocr_text(key) for key in keys]
+            missing = [i for i, text in enumerate(batch_texts) if text is None]
+            
+            raw_texts = self._ocr_batch([images[i] for i in missing])
+            for i, raw_text in zip(missing, raw_texts):
+                batch_texts[i] = self._clean_ocr_text(raw_text)
+                self._cache_ocr_text(keys[i], batch_texts[i])
+            
+            texts.extend(batch_texts)
+        
+        return texts
+    
+    def _ocr_batch(self, images):
+        """
+        OCR page images, in parallel on the shared process pool when worthwhile
+        
+        Without a pool, pytesseract batches share one Tesseract process.
+        
+        Args:
+            images (list): PIL Image objects
+            
+        Returns:
+            list: Raw OCR text per image, empty where OCR failed
+        """
+        if OCR_BACKEND == 'paddle' and PADDLEOCR_AVAILABLE:
+            # The engine and its GPU context live in this process
+            return [_ocr_worker(image) for image in images]
+        
+        if len(images) > 1 and OCR_WORKERS > 1:
+            try:
+                return list(_get_ocr_pool().map(_ocr_worker, images))
+            except Exception as e:
+                logger.warning(f"OCR process pool failed, running sequentially: {str(e)}")
+        
+        if len(images) > 1 and not TESSEROCR_AVAILABLE:
+            try:
+                return _run_tesseract_batch(images)
+            except Exception as e:
+                logger.warning(f"Batched Tesseract run failed, running per image: {str(e)}")
+        
+        return [_ocr_worker(image) for image in images]
+    
+    def _render_page_for_ocr(self, page):
+        """
+        Rasterize a PDF page as a bilevel grayscale image for OCR
+        
+        Args:
+            page: PyMuPDF page object
+            
+        Returns:
+            PIL.Image: Black-and-white page image at ocr_dpi
+        """
+        zoom = self.ocr_dpi / 72
+        pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), colorspace=fitz.csGRAY, alpha=False)
+        image = Image.frombytes("L", (pix.width, pix.height), pix.samples)
+        
+        # Binarize up front so Tesseract can skip its own thresholding
+        return self._binarize(image)
+    
+    def _binarize(self, image):
+        """
+        Threshold a grayscale image to black and white for OCR
+        
+        With OpenCV the cut-off is chosen from the image histogram (Otsu);
+        otherwise contrast is stretched and a fixed mid-grey cut-off used.
+        
+        Args:
+            image: PIL Image in mode 'L'
+            
+        Returns:
+            PIL.Image: Black-and-white image in mode '1'
+        """
+        if CV2_AVAILABLE:
+            _, bilevel = cv2.threshold(np.asarray(image), 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+            # Pixels are already 0 or 255, so the conversion does not dither
+            return Image.fromarray(bilevel).convert('1')
+        
+        image = ImageOps.autocontrast(image)
+        return image.point(lambda p: 255 if p >= 128 else 0, '1')
+    
+    def extract_from_image(self, source):
         """
         Extract text from image file using OCR
         
         Args:
-            filepath (str): Path to image file
+            source (str or bytes): Path to image file or its raw bytes
             
         Returns:
             str: Extracted text content
         """
         try:
-            if not os.path.exists(filepath):
-                raise FileNotFoundError(f"Image file not found: {filepath}")
+            in_memory = isinstance(source, (bytes, bytearray))
+            if not in_memory and not os.path.exists(source):
+                raise FileNotFoundError(f"Image file not found: {source}")
             
             # Open and process image
-            with Image.open(filepath) as image:
+            with Image.open(io.BytesIO(source) if in_memory else source, formats=IMAGE_FORMATS) as image:
                 logger.info(f"Processing image: {image.size} pixels, mode: {image.mode}")
                 
-                # Convert to RGB if necessary
-                if image.mode != 'RGB':
-                    image = image.convert('RGB')
+                if image.format == 'JPEG':
+                    # libjpeg can decode straight to grayscale and scale by up
+                    # to 1/8 during the IDCT, never below the OCR size
+                    image.draft('L', self._ocr_size(image.size))
                 
-                # Configure OCR parameters
-                custom_config = r'--oem 3 --psm 6 -c tessedit_char_whitelist=0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz .,!?@#$%^&*()_+-=[]{}|;:,.<>?'
-                
-                # Extract text using OCR
-                extracted_text = pytesseract.image_to_string(
-                    image, 
-                    config=custom_config,
-                    lang='eng'
-                ).strip()
-                
-                if not extracted_text:
+                cleaned_text = self._ocr_image(image)
+                if not cleaned_text:
                     logger.warning("No text detected in image")
                     return ""
                 
-                # Clean up extracted text
-                cleaned_text = self._clean_ocr_text(extracted_text)
-                
                 logger.info(f"Successfully extracted {len(cleaned_text)} characters from image")
                 return cleaned_text
                 
         except Exception as e:
-            logger.error(f"Error extracting text from image {filepath}: {str(e)}")
+            logger.error(f"Error extracting text from image {self._describe(source)}: {str(e)}")
             raise Exception(f"Failed to extract text from image: {str(e)}")
     
+    async def aextract_from_image(self, source):
+        """
+        Extract text from an image without blocking the event loop
+        
+        With pytesseract each call waits on its own Tesseract subprocess, so
+        several images can be OCR'd concurrently from worker threads.
+        
+        Args:
+            source (str or bytes): Path to image file or its raw bytes
+            
+        Returns:
+            str: Extracted text content
+        """
+        return await asyncio.to_thread(self.extract_from_image, source)
+    
+    def _ocr_image(self, image):
+        """
+        Run Tesseract OCR on a PIL image
+        
+        Args:
+            image: PIL Image object
+            
+        Returns:
+            str: Cleaned OCR text
+        """
+        # Tesseract works on grayscale, so colour is dropped here rather than
+        # sent along; grayscale and bilevel input is passed through uncopied
+        if image.mode not in ('L', '1'):
+            image = image.convert('L')
+        
+        size = self._ocr_size(image.size)
+        if size != image.size:
+            logger.info(f"Downscaling image from {image.width}x{image.height} to {size[0]}x{size[1]} for OCR")
+            image = image.resize(size, Image.Resampling.LANCZOS)
+        
+        if CV2_AVAILABLE and image.mode == 'L':
+            # Binarize up front so Tesseract can skip its own thresholding
+            image = self._binarize(image)
+        
+        key = self._ocr_cache_key(image)
+        cleaned_text = self._cached_ocr_text(key)
+        if cleaned_text is not None:
+            return cleaned_text
+        
+        # Extract text using OCR
+        extracted_text = _run_ocr(image)
+        
+        # Clean up extracted text
+        cleaned_text = self._clean_ocr_text(extracted_text)
+        self._cache_ocr_text(key, cleaned_text)
+        return cleaned_text
+    
+    def _ocr_size(self, size):
+        """
+        Size an image is OCR'd at, with its longest side capped at ocr_max_side
+        
+        Args:
+            size (tuple): Image (width, height)
+            
+        Returns:
+            tuple: Target (width, height), aspect ratio preserved
+        """
+        longest_side = max(size)
+        if longest_side <= self.ocr_max_side:
+            return size
+        
+        scale = self.ocr_max_side / longest_side
+        return (max(round(size[0] * scale), 1), max(round(size[1] * scale), 1))
+    
+    def _ocr_cache_key(self, image):
+        """Hash an image's pixels together with the OCR settings applied to them"""
+        digest = hashlib.sha256(f"{OCR_BACKEND}|{OCR_CONFIG}|{image.mode}|{image.size}".encode('utf-8'))
+        digest.update(image.tobytes())
+        return digest.hexdigest()
+    
+    def _cached_ocr_text(self, key):
+        """Return cached OCR text for an image hash, or None on a miss"""
+        cached = self.ocr_cache.get(key)
+        if cached is None:
+            return None
+        logger.debug(f"OCR cache hit: {key[:12]}")
+        return cached['text']
+    
+    def _cache_ocr_text(self, key, text):
+        """Remember OCR text for an image hash; empty results are retried next time"""
+        if text:
+            self.ocr_cache.set(key, {'text': text})
+    
+    def _describe(self, source):
+        """Describe a path or in-memory source for log messages"""
+        if isinstance(source, (bytes, bytearray)):
+            return f"<{len(source)} bytes in memory>"
+        return source
+    
     def _clean_ocr_text(self, text):
         """
         Clean and normalize OCR-extracted text
@@ -128,14 +699,9 @@ class TextExtractor:
             if cleaned_line:
                 lines.append(cleaned_line)
         
-        # Join lines with single newlines
-        cleaned_text = '\n'.join(lines)
-        
-        # Remove multiple consecutive newlines
-        while '\n\n\n' in cleaned_text:
-            cleaned_text = cleaned_text.replace('\n\n\n', '\n\n')
-        
-        return cleaned_text.strip()
+        # Join lines with single newlines; blank lines were dropped above, so
+        # there are no runs of newlines left to collapse
+        return '\n'.join(lines)
     
     def get_text_preview(self, text, max_chars=200):
         """
@@ -154,11 +720,9 @@ class TextExtractor:
         if len(text) <= max_chars:
             return text
         
-        # Find a good breaking point near the limit
-        preview = text[:max_chars]
-        last_space = preview.rfind(' ')
-        
-        if last_space > max_chars * 0.8:  # If space is reasonably close to limit
-            preview = preview[:last_space]
+        # Break at the last space if it is reasonably close to the limit,
+        # searching only that window of the original text
+        last_space = text.rfind(' ', int(max_chars * 0.8) + 1, max_chars)
+        cut = last_space if last_space != -1 else max_chars
         
-        return preview + "..."
+        return text[:cut] + "..."
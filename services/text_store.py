@@ -0,0 +1,70 @@
+import time
+import uuid
+import logging
+import threading
+from services.redis_client import create_redis_client
+
+logger = logging.getLogger(__name__)
+
+class TextStore:
+    """Service for holding extracted text briefly so pages can load it lazily"""
+    
+    def __init__(self, ttl_seconds=600):
+        self.ttl_seconds = ttl_seconds
+        self._texts = {}
+        self._lock = threading.Lock()
+        self.redis_client = create_redis_client()
+    
+    def put(self, text):
+        """
+        Store text for later retrieval
+        
+        Args:
+            text (str): Text content
+            
+        Returns:
+            str: Result id for get
+        """
+        result_id = uuid.uuid4().hex
+        
+        if self.redis_client:
+            try:
+                self.redis_client.setex(f"text:{result_id}", self.ttl_seconds, text.encode('utf-8'))
+                return result_id
+            except Exception as e:
+                logger.warning(f"Redis text store failed: {str(e)}")
+        
+        now = time.time()
+        with self._lock:
+            expired = [key for key, (expires_at, _) in self._texts.items() if expires_at < now]
+            for key in expired:
+                del self._texts[key]
+            self._texts[result_id] = (now + self.ttl_seconds, text)
+        
+        return result_id
+    
+    def get(self, result_id):
+        """
+        Retrieve stored text
+        
+        Args:
+            result_id (str): Result id returned by put
+            
+        Returns:
+            str: Text content or None if unknown or expired
+        """
+        with self._lock:
+            entry = self._texts.get(result_id)
+        if entry is not None:
+            expires_at, text = entry
+            return text if expires_at >= time.time() else None
+        
+        if self.redis_client:
+            try:
+                cached = self.redis_client.get(f"text:{result_id}")
+                if cached is not None:
+                    return cached.decode('utf-8')
+            except Exception as e:
+                logger.warning(f"Redis text lookup failed: {str(e)}")
+        
+        return None
@@ -0,0 +1,57 @@
+import pytest
+
+from services.analysis_cache import AnalysisCache
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    monkeypatch.delenv('REDIS_URL', raising=False)
+    return AnalysisCache(max_entries=2)
+
+
+class CountingAnalyzer:
+    """Analysis stub returning a fixed result and counting its calls"""
+    
+    def __init__(self, results):
+        self.results = results
+        self.calls = 0
+    
+    def __call__(self, text):
+        self.calls += 1
+        return dict(self.results)
+
+
+def test_caches_complete_results(cache):
+    analyze = CountingAnalyzer({'word_count': 3, 'degraded': False})
+    
+    first = cache.get_or_analyze('some post text', analyze)
+    second = cache.get_or_analyze('some post text', analyze)
+    
+    assert first == second == {'word_count': 3, 'degraded': False}
+    assert analyze.calls == 1
+    assert cache.get(cache.make_key('some post text')) == first
+
+
+@pytest.mark.parametrize('results', [
+    {'error': 'Analysis failed'},
+    {'word_count': 3, 'degraded': True},
+])
+def test_does_not_cache_failed_or_degraded_results(cache, results):
+    analyze = CountingAnalyzer(results)
+    
+    assert cache.get_or_analyze('some post text', analyze) == results
+    assert cache.get_or_analyze('some post text', analyze) == results
+    
+    assert analyze.calls == 2
+    assert cache.get(cache.make_key('some post text')) is None
+
+
+def test_evicts_least_recently_used(cache):
+    cache.set('a', {'n': 1})
+    cache.set('b', {'n': 2})
+    cache.get('a')
+    cache.set('c', {'n': 3})
+    
+    assert cache.get('a') == {'n': 1}
+    assert cache.get('b') is None
+    assert cache.get('c') == {'n': 3}
@@ -0,0 +1,164 @@
+import io
+import hashlib
+
+import pytest
+
+from services.file_handler import FileHandler
+
+BOUNDARY = 'test-boundary'
+CONTENT_TYPE = f'multipart/form-data; boundary={BOUNDARY}'
+
+PDF = b'%PDF-1.4\n' + b'0' * 64
+PNG = b'\x89PNG\r\n\x1a\n' + b'0' * 64
+JPEG = b'\xff\xd8\xff\xe0\x00\x10JFIF\x00' + b'0' * 64
+
+
+def multipart(*parts):
+    """Encode (name, filename, data) parts as a multipart/form-data body"""
+    body = b''
+    for name, filename, data in parts:
+        disposition = f'form-data; name="{name}"'
+        if filename is not None:
+            disposition += f'; filename="{filename}"'
+        body += f'--{BOUNDARY}\r\nContent-Disposition: {disposition}\r\n\r\n'.encode() + data + b'\r\n'
+    return body + f'--{BOUNDARY}--\r\n'.encode()
+
+
+@pytest.fixture
+def handler(tmp_path):
+    return FileHandler(str(tmp_path), {'pdf', 'png', 'jpg', 'jpeg'})
+
+
+def upload(handler, *parts):
+    return handler.stream_upload(io.BytesIO(multipart(*parts)), CONTENT_TYPE)
+
+
+@pytest.mark.parametrize('filename, data, extension', [
+    ('post.pdf', PDF, 'pdf'),
+    ('post.png', PNG, 'png'),
+    ('post.jpg', JPEG, 'jpg'),
+    ('post.JPEG', JPEG, 'jpg'),
+])
+def test_accepts_supported_types(handler, filename, data, extension):
+    name, result, error = upload(handler, ('file', filename, data))
+    
+    assert name == filename
+    assert error is None
+    assert result['extension'] == extension
+    assert bytes(result['source']) == data
+    assert result['path'] is None
+    assert result['size'] == len(data)
+    assert result['sha256'] == hashlib.sha256(data).hexdigest()
+
+
+def test_rejects_unknown_content(handler):
+    name, result, error = upload(handler, ('file', 'post.png', b'GIF89a' + b'0' * 64))
+    
+    assert name == 'post.png'
+    assert result is None
+    assert error == 'File content is not a PDF, PNG or JPEG'
+
+
+def test_rejects_extension_mismatch(handler):
+    _, result, error = upload(handler, ('file', 'post.pdf', PNG))
+    
+    assert result is None
+    assert error == 'File does not appear to be a valid PDF'
+
+
+def test_rejects_empty_file(handler):
+    _, result, error = upload(handler, ('file', 'post.pdf', b''))
+    
+    assert result is None
+    assert error == 'File appears to be empty'
+
+
+def test_disallowed_extension_is_not_buffered(handler):
+    name, result, error = upload(handler, ('file', 'post.gif', PNG))
+    
+    assert name == 'post.gif'
+    assert result is None
+    assert error is None
+
+
+def test_missing_file_field(handler):
+    assert upload(handler, ('caption', None, b'hello')) == (None, None, None)
+
+
+def test_rejects_non_multipart_body(handler):
+    assert handler.stream_upload(io.BytesIO(PDF), 'application/pdf') == (None, None, None)
+
+
+def test_ignores_data_from_other_fields(handler):
+    _, result, error = upload(
+        handler,
+        ('file', 'post.pdf', PDF),
+        ('caption', None, b'not part of the file'),
+        ('other', 'other.png', PNG),
+    )
+    
+    assert error is None
+    assert bytes(result['source']) == PDF
+
+
+def test_rejects_files_over_size_limit(handler):
+    data = PDF + b'0' * handler.max_file_size
+    
+    _, result, error = upload(handler, ('file', 'post.pdf', data))
+    
+    assert result is None
+    assert error == 'File too large. Maximum size: 16MB'
+
+
+def test_spills_large_uploads_to_disk(handler, tmp_path):
+    handler.spool_size = 1024
+    data = PDF + bytes(range(256)) * 64
+    
+    _, result, error = upload(handler, ('file', 'post.pdf', data))
+    
+    assert error is None
+    assert result['path'] and result['source'] == result['path']
+    assert result['path'].startswith(str(tmp_path))
+    with open(result['path'], 'rb') as f:
+        assert f.read() == data
+    assert result['sha256'] == hashlib.sha256(data).hexdigest()
+    
+    handler.discard_upload(result)
+    assert not list(tmp_path.iterdir())
+
+
+def test_rejected_spilled_upload_is_removed(handler, tmp_path):
+    handler.spool_size = 1024
+    handler.max_file_size = 4096
+    
+    _, result, error = upload(handler, ('file', 'post.pdf', PDF + b'0' * 8192))
+    
+    assert result is None
+    assert error.startswith('File too large')
+    assert not list(tmp_path.iterdir())
+
+
+@pytest.mark.parametrize('header, file_type', [
+    (PDF[:10], 'pdf'),
+    (PNG[:10], 'png'),
+    (JPEG[:10], 'jpg'),
+    (b'\xff\xd8\xff\xdb\x00\x43\x00\x08\x06\x06', 'jpg'),
+    (b'\x00\x00\x00\x00\x00\x00JFIF', 'jpg'),
+    (b'GIF89a\x01\x00\x01\x00', None),
+    (b'JFIF\x00\x00\x00\x00\x00\x00', None),
+    (b'\x00\x00JFIF\x00\x00\x00\x00', None),
+    (b'', None),
+])
+def test_detect_file_type(handler, header, file_type):
+    assert handler.detect_file_type(header) == file_type
+
+
+@pytest.mark.parametrize('header, filename, expected', [
+    (PDF[:10], 'post.pdf', ('pdf', None)),
+    (JPEG[:10], 'post.jpeg', ('jpg', None)),
+    (JPEG[:10], 'post.png', (None, 'File does not appear to be a valid PNG')),
+    (PNG[:10], 'post.jpg', (None, 'File does not appear to be a valid JPEG')),
+    (b'GIF89a\x01\x00\x01\x00', 'post.pdf', (None, 'File content is not a PDF, PNG or JPEG')),
+])
+def test_validate_header(handler, header, filename, expected):
+    assert handler.validate_header(header, filename) == expected
@@ -0,0 +1,75 @@
+import time
+import threading
+
+import pytest
+
+from services.job_queue import JobQueue
+
+
+@pytest.fixture
+def queue(monkeypatch):
+    monkeypatch.delenv('REDIS_URL', raising=False)
+    queue = JobQueue(max_workers=1)
+    yield queue
+    queue.executor.shutdown(wait=True)
+
+
+def wait_for(queue, job_id, status, timeout=5):
+    """Poll a job until it reaches status"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = queue.get_status(job_id)
+        if job['status'] == status:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"Job {job_id} did not reach {status}: {queue.get_status(job_id)}")
+
+
+def test_job_moves_from_queued_to_started_to_finished(queue):
+    started = threading.Event()
+    release = threading.Event()
+    
+    def blocking_job():
+        started.set()
+        release.wait(5)
+        return 'first'
+    
+    first_id = queue.enqueue(blocking_job)
+    assert started.wait(5)
+    
+    # The single worker is busy, so the next job waits in the queue
+    second_id = queue.enqueue(lambda value: {'value': value}, 42)
+    assert queue.get_status(first_id)['status'] == 'started'
+    assert queue.get_status(second_id)['status'] == 'queued'
+    
+    release.set()
+    assert wait_for(queue, first_id, 'finished')['result'] == 'first'
+    
+    job = wait_for(queue, second_id, 'finished')
+    assert job['job_id'] == second_id
+    assert job['result'] == {'value': 42}
+
+
+def test_failed_job_reports_error(queue):
+    def failing_job():
+        raise ValueError('extraction failed')
+    
+    job_id = queue.enqueue(failing_job)
+    
+    job = wait_for(queue, job_id, 'failed')
+    assert job['error'] == 'extraction failed'
+    assert 'result' not in job
+
+
+def test_unknown_job_is_none(queue):
+    assert queue.get_status('missing') is None
+
+
+def test_prunes_expired_jobs(queue):
+    job_id = queue.enqueue(lambda: None)
+    wait_for(queue, job_id, 'finished')
+    
+    queue.ttl_seconds = -1
+    queue._prune()
+    
+    assert queue.get_status(job_id) is None
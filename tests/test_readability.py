@@ -0,0 +1,53 @@
+import importlib
+
+import pytest
+import textstat
+
+from services.ai_analyzer import AIAnalyzer
+
+SAMPLES = [
+    "The cat sat on the mat. It was a sunny day, and everyone felt happy.",
+    "Our quarterly engagement metrics demonstrate considerable improvement across "
+    "international communities. Consequently, we are expanding the creative team! "
+    "Do you want to join us? Apply today.",
+    "Short post with no final punctuation but several words in it",
+]
+
+
+@pytest.fixture(autouse=True)
+def syllables_without_cmudict(monkeypatch):
+    # Count syllables with pyphen alone so the comparison does not depend on
+    # the NLTK CMU dictionary being downloaded
+    try:
+        counts = importlib.import_module('textstat.backend.counts._count_syllables')
+    except ImportError:
+        counts = None
+    
+    if counts is not None:
+        monkeypatch.setattr(counts, 'get_cmudict', lambda lang: None)
+        counts.count_syllables.cache_clear()
+    yield
+    if counts is not None:
+        counts.count_syllables.cache_clear()
+
+
+@pytest.fixture
+def analyzer(monkeypatch):
+    monkeypatch.delenv('OPENAI_API_KEY', raising=False)
+    monkeypatch.delenv('REDIS_URL', raising=False)
+    return AIAnalyzer()
+
+
+@pytest.mark.parametrize('text', SAMPLES)
+def test_matches_textstat(analyzer, text):
+    metrics = analyzer._readability_metrics(text)
+    
+    assert metrics['word_count'] == textstat.lexicon_count(text)
+    assert metrics['sentence_count'] == textstat.sentence_count(text)
+    assert metrics['avg_sentence_length'] == pytest.approx(metrics['word_count'] / metrics['sentence_count'])
+    assert metrics['avg_syllables_per_word'] == pytest.approx(textstat.syllable_count(text) / metrics['word_count'])
+    assert metrics['flesch_reading_ease'] == pytest.approx(textstat.flesch_reading_ease(text))
+    assert metrics['flesch_kincaid_grade'] == pytest.approx(textstat.flesch_kincaid_grade(text))
+    assert metrics['coleman_liau_index'] == pytest.approx(textstat.coleman_liau_index(text))
+    assert metrics['automated_readability_index'] == pytest.approx(textstat.automated_readability_index(text))
+    assert metrics['gunning_fog'] == pytest.approx(textstat.gunning_fog(text))